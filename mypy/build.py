@@ -10,7 +10,6 @@ The function build() is the main interface to this module.
 """
 # TODO: More consistent terminology, e.g. path/fnam, module/id, state/file
 
-import contextlib
 import errno
 import gc
 import json
@@ -35,7 +34,7 @@ from mypy.indirection import TypeIndirectionVisitor
 from mypy.errors import Errors, CompileError, ErrorInfo, report_internal_error
 from mypy.util import (
     DecodeError, decode_python_encoding, is_sub_path, get_mypy_comments, module_prefix,
-    read_py_file, hash_digest, is_typeshed_file, is_stub_package_file
+    read_py_file, hash_digest, is_typeshed_file, is_stub_package_file, json_loads
 )
 if TYPE_CHECKING:
     from mypy.report import Reports  # Avoid unconditional slow import
@@ -802,7 +801,7 @@ class BuildManager:
         t0 = time.time()
         if id in self.fg_deps_meta:
             # TODO: Assert deps file wasn't changed.
-            deps = json.loads(self.metastore.read(self.fg_deps_meta[id]['path']))
+            deps = json_loads(self.metastore.read(self.fg_deps_meta[id]['path']))
         else:
             deps = {}
         val = {k: set(v) for k, v in deps.items()}
@@ -1089,7 +1088,7 @@ def _load_json_file(file: str, manager: BuildManager,
     if manager.verbosity() >= 2:
         manager.trace(log_success + data.rstrip())
     try:
-        result = json.loads(data)
+        result = json_loads(data)
     except ValueError:  # TODO: JSONDecodeError in 3.5
         manager.errors.set_file(file, None)
         manager.errors.report(-1, -1,
@@ -1712,6 +1711,39 @@ During implementation more wrinkles were found.
 """
 
 
+class StateContext:
+    """Context manager returned by State.wrap_context().
+
+    This is a plain class rather than a @contextlib.contextmanager generator,
+    since it's entered for every module in every processing pass.
+    """
+
+    def __init__(self, state: 'State', check_blockers: bool) -> None:
+        self.state = state
+        self.check_blockers = check_blockers
+
+    def __enter__(self) -> None:
+        errors = self.state.manager.errors
+        self.save_import_context = errors.import_context()
+        errors.set_import_context(self.state.import_context)
+
+    def __exit__(self,
+                 exc_ty: object,
+                 exc_val: Optional[BaseException],
+                 exc_tb: Optional[types.TracebackType]) -> None:
+        state = self.state
+        if exc_val is not None:
+            if isinstance(exc_val, Exception) and not isinstance(exc_val, CompileError):
+                # This doesn't return.
+                report_internal_error(exc_val, state.path, 0, state.manager.errors,
+                                      state.options, state.manager.stdout, state.manager.stderr)
+            return
+        state.manager.errors.set_import_context(self.save_import_context)
+        # TODO: Move this away once we've removed the old semantic analyzer?
+        if self.check_blockers:
+            state.check_blockers()
+
+
 class ModuleNotFound(Exception):
     """Control flow exception to signal that a module was not found."""
 
@@ -1900,13 +1932,9 @@ class State:
                 # This is just a weird filename, don't add anything
                 self.ancestors = []
                 return
-        # All parent packages are new ancestors.
-        ancestors = []
-        parent = self.id
-        while '.' in parent:
-            parent, _ = parent.rsplit('.', 1)
-            ancestors.append(parent)
-        self.ancestors = ancestors
+        # All parent packages are new ancestors, innermost first.
+        parts = self.id.split('.')
+        self.ancestors = ['.'.join(parts[:i]) for i in range(len(parts) - 1, 0, -1)]
 
     def is_fresh(self) -> bool:
         """Return whether the cache data for this file is fresh."""
@@ -1937,8 +1965,7 @@ class State:
             self.manager.log("Bailing due to blocking errors")
             self.manager.errors.raise_error()
 
-    @contextlib.contextmanager
-    def wrap_context(self, check_blockers: bool = True) -> Iterator[None]:
+    def wrap_context(self, check_blockers: bool = True) -> 'StateContext':
         """Temporarily change the error import context to match this state.
 
         Also report an internal error if an unexpected exception was raised
@@ -1948,19 +1975,7 @@ class State:
         for a file (across multiple targets) to maintain backward
         compatibility.
         """
-        save_import_context = self.manager.errors.import_context()
-        self.manager.errors.set_import_context(self.import_context)
-        try:
-            yield
-        except CompileError:
-            raise
-        except Exception as err:
-            report_internal_error(err, self.path, 0, self.manager.errors,
-                                  self.options, self.manager.stdout, self.manager.stderr)
-        self.manager.errors.set_import_context(save_import_context)
-        # TODO: Move this away once we've removed the old semantic analyzer?
-        if check_blockers:
-            self.check_blockers()
+        return StateContext(self, check_blockers)
 
     def load_fine_grained_deps(self) -> Dict[str, Set[str]]:
         return self.manager.load_fine_grained_deps(self.id)
@@ -1971,7 +1986,7 @@ class State:
         t0 = time.time()
         raw = self.manager.metastore.read(self.meta.data_json)
         t1 = time.time()
-        data = json.loads(raw)
+        data = json_loads(raw)
         t2 = time.time()
         # TODO: Assert data file wasn't changed.
         self.tree = MypyFile.deserialize(data)
@@ -2148,9 +2163,12 @@ class State:
             self.priorities[id] = min(pri, self.priorities.get(id, PRI_ALL))
             if id == self.id:
                 continue
-            self.add_dependency(id)
+            # Nothing is suppressed yet, so dep_line_map has exactly the
+            # dependencies seen so far and add_dependency() isn't needed.
             if id not in self.dep_line_map:
                 self.dep_line_map[id] = line
+                self.dependencies.append(id)
+                self.dependencies_set.add(id)
         # Every module implicitly depends on builtins.
         if self.id != 'builtins':
             self.add_dependency('builtins')
@@ -2838,26 +2856,30 @@ def load_graph(sources: List[BuildSource], manager: BuildManager,
             # because they are not in build with `follow-imports=skip`.
             # This way we could avoid overhead of cloning options in `State.__init__()`
             # below to get the option value. This is quite minor performance loss however.
-            added = [dep for dep in st.suppressed if find_module_simple(dep, manager)]
+            added = {dep for dep in st.suppressed if find_module_simple(dep, manager)}
         else:
             # During initial loading we don't care about newly added modules,
             # they will be taken care of during fine grained update. See also
             # comment about this in `State.__init__()`.
-            added = []
+            added = set()
+        ancestors = set(st.ancestors)
+        dep_line = st.dep_line_map.get
+        # Note that we iterate over a copy, since the loop body may move items
+        # between st.dependencies and st.suppressed.
         for dep in st.ancestors + dependencies + st.suppressed:
             ignored = dep in st.suppressed_set and dep not in entry_points
             if ignored and dep not in added:
                 manager.missing_modules.add(dep)
             elif dep not in graph:
                 try:
-                    if dep in st.ancestors:
+                    if dep in ancestors:
                         # TODO: Why not 'if dep not in st.dependencies' ?
                         # Ancestors don't have import context.
                         newst = State(id=dep, path=None, source=None, manager=manager,
                                       ancestor_for=st)
                     else:
                         newst = State(id=dep, path=None, source=None, manager=manager,
-                                      caller_state=st, caller_line=st.dep_line_map.get(dep, 1))
+                                      caller_state=st, caller_line=dep_line(dep, 1))
                 except ModuleNotFound:
                     if dep in st.dependencies_set:
                         st.suppress_dependency(dep)
@@ -2923,8 +2945,14 @@ def process_graph(graph: Graph, manager: BuildManager) -> None:
         for id in scc:
             deps.update(graph[id].dependencies)
         deps -= ascc
-        stale_deps = {id for id in deps if id in graph and not graph[id].is_interface_fresh()}
-        fresh = fresh and not stale_deps
+        if fresh:
+            stale_deps = {id for id in deps
+                          if id in graph and not graph[id].is_interface_fresh()}
+            fresh = not stale_deps
+        else:
+            # The SCC is stale anyway, so stale dependencies are only needed
+            # for the log message below.
+            stale_deps = set()
         undeps = set()
         if fresh:
             # Check if any dependencies that were suppressed according
@@ -2969,8 +2997,11 @@ def process_graph(graph: Graph, manager: BuildManager) -> None:
             fresh_msg = "inherently stale"
             if stale_scc != ascc:
                 fresh_msg += " (%s)" % " ".join(sorted(stale_scc))
-            if stale_deps:
-                fresh_msg += " with stale deps (%s)" % " ".join(sorted(stale_deps))
+            if manager.verbosity() >= 1:
+                logged_deps = {id for id in deps
+                               if id in graph and not graph[id].is_interface_fresh()}
+                if logged_deps:
+                    fresh_msg += " with stale deps (%s)" % " ".join(sorted(logged_deps))
         else:
             fresh_msg = "stale due to deps (%s)" % " ".join(sorted(stale_deps))
 
@@ -3145,15 +3176,15 @@ def sorted_components(graph: Graph,
     if vertices is None:
         vertices = set(graph)
     edges = {id: deps_filtered(graph, vertices, id, pri_max) for id in vertices}
-    sccs = list(strongly_connected_components(vertices, edges))
+    sccs = [frozenset(scc) for scc in strongly_connected_components(vertices, edges)]
     # Topsort.
-    sccsmap = {id: frozenset(scc) for scc in sccs for id in scc}
+    sccsmap = {id: scc for scc in sccs for id in scc}
     data = {}  # type: Dict[AbstractSet[str], Set[AbstractSet[str]]]
     for scc in sccs:
         deps = set()  # type: Set[AbstractSet[str]]
         for id in scc:
-            deps.update(sccsmap[x] for x in deps_filtered(graph, vertices, id, pri_max))
-        data[frozenset(scc)] = deps
+            deps.update(sccsmap[x] for x in edges[id])
+        data[scc] = deps
     res = []
     for ready in topsort(data):
         # Sort the sets in ready by reversed smallest State.order.  Examples:
@@ -3199,29 +3230,40 @@ def strongly_connected_components(vertices: AbstractSet[str],
     stack = []  # type: List[str]
     index = {}  # type: Dict[str, int]
     boundaries = []  # type: List[int]
+    # The DFS is driven by an explicit stack of (vertex, remaining out-edges)
+    # pairs instead of recursion, so that very deep import chains don't hit
+    # the recursion limit.
+    work = []  # type: List[Tuple[str, Iterator[str]]]
 
-    def dfs(v: str) -> Iterator[Set[str]]:
-        index[v] = len(stack)
-        stack.append(v)
-        boundaries.append(index[v])
-
-        for w in edges[v]:
-            if w not in index:
-                yield from dfs(w)
-            elif w not in identified:
-                while index[w] < boundaries[-1]:
+    for root in vertices:
+        if root in index:
+            continue
+        index[root] = len(stack)
+        stack.append(root)
+        boundaries.append(index[root])
+        work.append((root, iter(edges[root])))
+        while work:
+            v, targets = work[-1]
+            for w in targets:
+                if w not in index:
+                    # Descend into w; the rest of v's edges are visited afterwards.
+                    index[w] = len(stack)
+                    stack.append(w)
+                    boundaries.append(index[w])
+                    work.append((w, iter(edges[w])))
+                    break
+                elif w not in identified:
+                    while index[w] < boundaries[-1]:
+                        boundaries.pop()
+            else:
+                # All edges of v have been visited.
+                work.pop()
+                if boundaries[-1] == index[v]:
                     boundaries.pop()
-
-        if boundaries[-1] == index[v]:
-            boundaries.pop()
-            scc = set(stack[index[v]:])
-            del stack[index[v]:]
-            identified.update(scc)
-            yield scc
-
-    for v in vertices:
-        if v not in index:
-            yield from dfs(v)
+                    scc = set(stack[index[v]:])
+                    del stack[index[v]:]
+                    identified.update(scc)
+                    yield scc
 
 
 def topsort(data: Dict[AbstractSet[str],
@@ -3257,20 +3299,32 @@ def topsort(data: Dict[AbstractSet[str],
 
     From http://code.activestate.com/recipes/577413/.
     """
-    # TODO: Use a faster algorithm?
     for k, v in data.items():
         v.discard(k)  # Ignore self dependencies.
     for item in set.union(*data.values()) - set(data.keys()):
         data[item] = set()
-    while True:
-        ready = {item for item, dep in data.items() if not dep}
-        if not ready:
-            break
+    # This is Kahn's algorithm, processed one layer of ready items at a time.
+    # Keep track of the number of unprocessed dependencies of each item and of
+    # the reverse edges, so that each edge is only looked at once.
+    num_deps = {item: len(dep) for item, dep in data.items()}
+    dependents = {
+        item: [] for item in data
+    }  # type: Dict[AbstractSet[str], List[AbstractSet[str]]]
+    for item, dep in data.items():
+        for x in dep:
+            dependents[x].append(item)
+    ready = {item for item, n in num_deps.items() if not n}
+    while ready:
         yield ready
-        data = {item: (dep - ready)
-                for item, dep in data.items()
-                if item not in ready}
-    assert not data, "A cyclic dependency exists amongst %r" % data
+        next_ready = set()  # type: Set[AbstractSet[str]]
+        for x in ready:
+            for item in dependents[x]:
+                num_deps[item] -= 1
+                if not num_deps[item]:
+                    next_ready.add(item)
+        ready = next_ready
+    cyclic = {item for item, n in num_deps.items() if n}
+    assert not cyclic, "A cyclic dependency exists amongst %r" % cyclic
 
 
 def missing_stubs_file(cache_dir: str) -> str:
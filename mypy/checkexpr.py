@@ -4534,8 +4534,8 @@ def is_operator_method(fullname: Optional[str]) -> bool:
         return False
     short_name = fullname.split('.')[-1]
     return (
-        short_name in nodes.op_methods.values() or
-        short_name in nodes.reverse_op_methods.values() or
+        short_name in nodes.op_method_set or
+        short_name in nodes.reverse_op_method_set or
         short_name in nodes.unary_op_methods.values())
 
 
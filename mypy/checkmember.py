@@ -672,6 +672,9 @@ def check_self_arg(functype: FunctionLike,
         return functype
     if len(new_items) == 1:
         return new_items[0]
+    if len(new_items) == len(items):
+        # All items matched, so the original overload can be reused as is.
+        return functype
     return Overloaded(new_items)
 
 
@@ -1,14 +1,13 @@
 """Shared code between dmypy.py and dmypy_server.py.
 
-This should be pretty lightweight and not depend on other mypy code (other than ipc).
+This should be pretty lightweight and not depend on other mypy code (other than ipc and util).
 """
 
-import json
-
 from typing import Any
 from typing_extensions import Final
 
 from mypy.ipc import IPCBase
+from mypy.util import json_loads
 
 DEFAULT_STATUS_FILE = '.dmypy.json'  # type: Final
 
@@ -23,7 +22,7 @@ def receive(connection: IPCBase) -> Any:
     if not bdata:
         raise OSError("No data received")
     try:
-        data = json.loads(bdata.decode('utf8'))
+        data = json_loads(bdata.decode('utf8'))
     except Exception as e:
         raise OSError("Data received is not valid JSON") from e
     if not isinstance(data, dict):
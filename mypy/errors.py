@@ -404,6 +404,10 @@ class Errors:
         """Return the number of generated messages."""
         return sum(len(x) for x in self.error_info_map.values())
 
+    def is_ignored_file(self) -> bool:
+        """Are non-blocking errors reported in the current file discarded?"""
+        return self.file in self.ignored_files
+
     def is_errors(self) -> bool:
         """Are there any generated messages?"""
         return bool(self.error_info_map)
@@ -31,7 +31,7 @@ advantage of the benefits.
 import os
 import stat
 import sys
-from typing import Dict, List, Set
+from typing import BinaryIO, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 from mypy.util import hash_digest
 from mypy_extensions import mypyc_attr
 
@@ -42,29 +42,37 @@ class FileSystemCache:
         # The package root is not flushed with the caches.
         # It is set by set_package_root() below.
         self.package_root = []  # type: List[str]
+        self._package_root_prefixes = ()  # type: Tuple[str, ...]
+        self._package_root_inits = frozenset()  # type: FrozenSet[str]
         self.flush()
 
     def set_package_root(self, package_root: List[str]) -> None:
         self.package_root = package_root
+        # Precomputed for init_under_package_root().
+        self._package_root_prefixes = tuple(package_root)
+        self._package_root_inits = frozenset(root + '__init__.py' for root in package_root)
 
     def flush(self) -> None:
         """Start another transaction and empty all caches."""
-        self.stat_cache = {}  # type: Dict[str, os.stat_result]
-        self.stat_error_cache = {}  # type: Dict[str, OSError]
-        self.listdir_cache = {}  # type: Dict[str, List[str]]
-        self.listdir_error_cache = {}  # type: Dict[str, OSError]
+        # The stat, listdir and read caches hold either the result of the
+        # operation or the error it raised, so that a single lookup is
+        # enough on both paths.
+        self.stat_cache = {}  # type: Dict[str, Union[os.stat_result, OSError]]
+        self.listdir_cache = {}  # type: Dict[str, Union[List[str], OSError]]
+        # Directory contents as sets, for fast membership checks in isfile_case().
+        self.listdir_set_cache = {}  # type: Dict[str, FrozenSet[str]]
         self.isfile_case_cache = {}  # type: Dict[str, bool]
         self.exists_case_cache = {}  # type: Dict[str, bool]
-        self.read_cache = {}  # type: Dict[str, bytes]
-        self.read_error_cache = {}  # type: Dict[str, Exception]
+        self.read_cache = {}  # type: Dict[str, Union[bytes, OSError]]
         self.hash_cache = {}  # type: Dict[str, str]
         self.fake_package_cache = set()  # type: Set[str]
 
     def stat(self, path: str) -> os.stat_result:
-        if path in self.stat_cache:
-            return self.stat_cache[path]
-        if path in self.stat_error_cache:
-            raise copy_os_error(self.stat_error_cache[path])
+        st = self.stat_cache.get(path)
+        if st is not None:
+            if isinstance(st, OSError):
+                raise copy_os_error(st)
+            return st
         try:
             st = os.stat(path)
         except OSError as err:
@@ -75,11 +83,27 @@ class FileSystemCache:
                     pass
             # Take a copy to get rid of associated traceback and frame objects.
             # Just assigning to __traceback__ doesn't free them.
-            self.stat_error_cache[path] = copy_os_error(err)
+            self.stat_cache[path] = copy_os_error(err)
             raise err
         self.stat_cache[path] = st
         return st
 
+    def _stat_or_none(self, path: str) -> Optional[os.stat_result]:
+        """Like stat(), but return None instead of raising OSError.
+
+        Cached errors don't need to be copied and raised again, which makes
+        this cheaper than catching the exception from stat().
+        """
+        st = self.stat_cache.get(path)
+        if st is None:
+            try:
+                return self.stat(path)
+            except OSError:
+                return None
+        if isinstance(st, OSError):
+            return None
+        return st
+
     def init_under_package_root(self, path: str) -> bool:
         """Is this path an __init__.py under a package root?
 
@@ -107,27 +131,15 @@ class FileSystemCache:
         dirname, basename = os.path.split(path)
         if basename != '__init__.py':
             return False
-        try:
-            st = self.stat(dirname)
-        except OSError:
+        if not self.isdir(dirname):
             return False
-        else:
-            if not stat.S_ISDIR(st.st_mode):
-                return False
-        ok = False
         drive, path = os.path.splitdrive(path)  # Ignore Windows drive name
         if os.path.isabs(path):
             path = os.path.relpath(path)
         path = os.path.normpath(path)
-        for root in self.package_root:
-            if path.startswith(root):
-                if path == root + basename:
-                    # A package root itself is never a package.
-                    ok = False
-                    break
-                else:
-                    ok = True
-        return ok
+        # A package root itself is never a package.
+        return (path.startswith(self._package_root_prefixes)
+                and path not in self._package_root_inits)
 
     def _fake_init(self, path: str) -> os.stat_result:
         """Prime the cache with a fake __init__.py file.
@@ -140,50 +152,62 @@ class FileSystemCache:
         assert basename == '__init__.py', path
         assert not os.path.exists(path), path  # Not cached!
         dirname = os.path.normpath(dirname)
-        st = self.stat(dirname)  # May raise OSError
-        # Get stat result as a sequence so we can modify it.
-        # (Alas, typeshed's os.stat_result is not a sequence yet.)
-        tpl = tuple(st)  # type: ignore[arg-type, var-annotated]
-        seq = list(tpl)  # type: List[float]
-        seq[stat.ST_MODE] = stat.S_IFREG | 0o444
-        seq[stat.ST_INO] = 1
-        seq[stat.ST_NLINK] = 1
-        seq[stat.ST_SIZE] = 0
-        tpl = tuple(seq)
-        st = os.stat_result(tpl)
+        dst = self.stat(dirname)  # May raise OSError
+        # An empty read-only file that otherwise looks like its directory.
+        # The fields are in the order of the os.stat_result sequence, and the
+        # times are whole seconds like in the sequence form.
+        st = os.stat_result((stat.S_IFREG | 0o444, 1, dst.st_dev, 1, dst.st_uid, dst.st_gid, 0,
+                             int(dst.st_atime), int(dst.st_mtime), int(dst.st_ctime)))
         self.stat_cache[path] = st
         # Make listdir() and read() also pretend this file exists.
         self.fake_package_cache.add(dirname)
+        res = self.listdir_cache.get(dirname)
+        if isinstance(res, list) and '__init__.py' not in res:
+            res.append('__init__.py')  # Updates the result as well as the cache
+            # The set cache may use another form of the path as the key, so
+            # just drop it. Fake __init__.py files are rare.
+            self.listdir_set_cache.clear()
         return st
 
     def listdir(self, path: str) -> List[str]:
-        path = os.path.normpath(path)
-        if path in self.listdir_cache:
-            res = self.listdir_cache[path]
-            # Check the fake cache.
-            if path in self.fake_package_cache and '__init__.py' not in res:
-                res.append('__init__.py')  # Updates the result as well as the cache
-            return res
-        if path in self.listdir_error_cache:
-            raise copy_os_error(self.listdir_error_cache[path])
+        # Results are cached under the normalized path and also under the
+        # path as given, so that a cache hit doesn't need to normalize it.
+        res = self.listdir_cache.get(path)
+        if res is None:
+            normpath = os.path.normpath(path)
+            res = self.listdir_cache.get(normpath)
+            if res is None:
+                res = self._listdir(normpath)
+            self.listdir_cache[path] = res
+        if isinstance(res, OSError):
+            raise copy_os_error(res)
+        return res
+
+    def _listdir(self, path: str) -> Union[List[str], OSError]:
         try:
             results = os.listdir(path)
         except OSError as err:
             # Like above, take a copy to reduce memory use.
-            self.listdir_error_cache[path] = copy_os_error(err)
-            raise err
-        self.listdir_cache[path] = results
-        # Check the fake cache.
+            error = copy_os_error(err)
+            self.listdir_cache[path] = error
+            return error
+        # Check the fake cache.  Fake __init__.py files created later
+        # are added by _fake_init().
         if path in self.fake_package_cache and '__init__.py' not in results:
             results.append('__init__.py')
+        self.listdir_cache[path] = results
         return results
 
+    def _listdir_set(self, path: str) -> FrozenSet[str]:
+        names = self.listdir_set_cache.get(path)
+        if names is None:
+            names = frozenset(self.listdir(path))  # May raise OSError
+            self.listdir_set_cache[path] = names
+        return names
+
     def isfile(self, path: str) -> bool:
-        try:
-            st = self.stat(path)
-        except OSError:
-            return False
-        return stat.S_ISREG(st.st_mode)
+        st = self._stat_or_none(path)
+        return st is not None and stat.S_ISREG(st.st_mode)
 
     def isfile_case(self, path: str, prefix: str) -> bool:
         """Return whether path exists and is a file.
@@ -205,14 +229,15 @@ class FileSystemCache:
         if not self.isfile(path):
             # Fast path
             return False
-        if path in self.isfile_case_cache:
-            return self.isfile_case_cache[path]
+        res = self.isfile_case_cache.get(path)
+        if res is not None:
+            return res
         head, tail = os.path.split(path)
         if not tail:
             self.isfile_case_cache[path] = False
             return False
         try:
-            names = self.listdir(head)
+            names = self._listdir_set(head)
             # This allows one to check file name case sensitively in
             # case-insensitive filesystems.
             res = tail in names
@@ -226,15 +251,16 @@ class FileSystemCache:
 
     def _exists_case(self, path: str, prefix: str) -> bool:
         """Helper to check path components in case sensitive fashion, up to prefix."""
-        if path in self.exists_case_cache:
-            return self.exists_case_cache[path]
+        res = self.exists_case_cache.get(path)
+        if res is not None:
+            return res
         head, tail = os.path.split(path)
         if not head.startswith(prefix) or not tail:
             # Only perform the check for paths under prefix.
             self.exists_case_cache[path] = True
             return True
         try:
-            names = self.listdir(head)
+            names = self._listdir_set(head)
             # This allows one to check file name case sensitively in
             # case-insensitive filesystems.
             res = tail in names
@@ -247,11 +273,8 @@ class FileSystemCache:
         return res
 
     def isdir(self, path: str) -> bool:
-        try:
-            st = self.stat(path)
-        except OSError:
-            return False
-        return stat.S_ISDIR(st.st_mode)
+        st = self._stat_or_none(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
 
     def exists(self, path: str) -> bool:
         try:
@@ -261,26 +284,49 @@ class FileSystemCache:
         return True
 
     def read(self, path: str) -> bytes:
-        if path in self.read_cache:
-            return self.read_cache[path]
-        if path in self.read_error_cache:
-            raise self.read_error_cache[path]
+        cached = self.read_cache.get(path)
+        if cached is not None:
+            if isinstance(cached, OSError):
+                raise cached
+            return cached
+
+        f = None  # type: Optional[BinaryIO]
+        if path not in self.stat_cache:
+            # Stat the open file, which saves a path lookup compared to
+            # calling self.stat() first. If opening fails, fall back to
+            # self.stat() below, which caches the error or primes the
+            # cache with a fake __init__.py file.
+            try:
+                f = open(path, 'rb')
+            except OSError:
+                pass
+            else:
+                try:
+                    # Stat before reading so that the contents of file are
+                    # from no earlier instant than the reported mtime.
+                    self.stat_cache[path] = os.fstat(f.fileno())
+                except OSError:
+                    f.close()
+                    raise
 
-        # Need to stat first so that the contents of file are from no
-        # earlier instant than the mtime reported by self.stat().
-        self.stat(path)
+        if f is None:
+            # Need to stat first so that the contents of file are from no
+            # earlier instant than the mtime reported by self.stat().
+            self.stat(path)
 
         dirname, basename = os.path.split(path)
         dirname = os.path.normpath(dirname)
         # Check the fake cache.
-        if basename == '__init__.py' and dirname in self.fake_package_cache:
+        if f is None and basename == '__init__.py' and dirname in self.fake_package_cache:
             data = b''
         else:
             try:
-                with open(path, 'rb') as f:
+                if f is None:
+                    f = open(path, 'rb')
+                with f:
                     data = f.read()
             except OSError as err:
-                self.read_error_cache[path] = err
+                self.read_cache[path] = err
                 raise
 
         self.read_cache[path] = data
@@ -288,9 +334,11 @@ class FileSystemCache:
         return data
 
     def hash_digest(self, path: str) -> str:
-        if path not in self.hash_cache:
+        res = self.hash_cache.get(path)
+        if res is None:
             self.read(path)
-        return self.hash_cache[path]
+            res = self.hash_cache[path]
+        return res
 
     def samefile(self, f1: str, f2: str) -> bool:
         s1 = self.stat(f1)
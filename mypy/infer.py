@@ -27,6 +27,10 @@ def infer_function_type_arguments(callee_type: CallableType,
       arg_kinds: nodes.ARG_* values for arg_types
       formal_to_actual: mapping from formal to actual variable indices
     """
+    if not callee_type.variables:
+        # Nothing to infer.
+        return []
+
     # Infer constraints.
     constraints = infer_constraints_for_callable(
         callee_type, arg_types, arg_kinds, formal_to_actual)
@@ -41,6 +45,8 @@ def infer_type_arguments(type_var_ids: List[TypeVarId],
                          is_supertype: bool = False) -> List[Optional[Type]]:
     # Like infer_function_type_arguments, but only match a single type
     # against a generic type.
+    if not type_var_ids:
+        return []
     constraints = infer_constraints(template, actual,
                                     SUPERTYPE_OF if is_supertype else SUBTYPE_OF)
     return solve_constraints(type_var_ids, constraints)
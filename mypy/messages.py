@@ -27,7 +27,7 @@ from mypy.types import (
 )
 from mypy.typetraverser import TypeTraverserVisitor
 from mypy.nodes import (
-    TypeInfo, Context, MypyFile, op_methods, op_methods_to_symbols,
+    TypeInfo, Context, MypyFile, op_method_set, op_methods_to_symbols,
     FuncDef, reverse_builtin_aliases,
     ARG_POS, ARG_OPT, ARG_NAMED, ARG_NAMED_OPT, ARG_STAR, ARG_STAR2,
     ReturnStmt, NameExpr, Var, CONTRAVARIANT, COVARIANT, SymbolNode,
@@ -84,6 +84,20 @@ SUGGESTED_TEST_FIXTURES = {
     'builtins.classmethod': 'classmethod.pyi',
 }  # type: Final
 
+# Short names of the typing aliases for builtin generic classes, such as 'List'.
+SHORT_BUILTIN_ALIASES = {
+    fullname: alias.split('.')[-1] for fullname, alias in reverse_builtin_aliases.items()
+}  # type: Final
+
+# Template for the note shown when an "__eq__" override narrows the argument type.
+COMPARISON_METHOD_EXAMPLE = dedent('''\
+    It is recommended for "__eq__" to work with arbitrary objects, for example:
+        def __eq__(self, other: object) -> bool:
+            if not isinstance(other, {class_name}):
+                return NotImplemented
+            return <logic to compare two {class_name} instances>
+    ''')  # type: Final
+
 
 class MessageBuilder:
     """Helper class for reporting type checker error messages with parameters.
@@ -145,6 +159,13 @@ class MessageBuilder:
     def is_errors(self) -> bool:
         return self.errors.is_errors()
 
+    def are_errors_discarded(self) -> bool:
+        """Would errors reported now be discarded?
+
+        Use this to avoid formatting messages that won't be shown.
+        """
+        return self.disable_count > 0 or self.errors.is_ignored_file()
+
     def most_recent_context(self) -> Context:
         """Return a dummy context matching the most recent generated error in current file."""
         line, column = self.errors.most_recent_error_location()
@@ -163,19 +184,20 @@ class MessageBuilder:
                origin: Optional[Context] = None,
                offset: int = 0) -> None:
         """Report an error or note (unless disabled)."""
+        if self.are_errors_discarded():
+            return
         if origin is not None:
             end_line = origin.end_line
         elif context is not None:
             end_line = context.end_line
         else:
             end_line = None
-        if self.disable_count <= 0:
-            self.errors.report(context.get_line() if context else -1,
-                               context.get_column() if context else -1,
-                               msg, severity=severity, file=file, offset=offset,
-                               origin_line=origin.get_line() if origin else None,
-                               end_line=end_line,
-                               code=code)
+        self.errors.report(context.get_line() if context else -1,
+                           context.get_column() if context else -1,
+                           msg, severity=severity, file=file, offset=offset,
+                           origin_line=origin.get_line() if origin else None,
+                           end_line=end_line,
+                           code=code)
 
     def fail(self,
              msg: str,
@@ -203,6 +225,8 @@ class MessageBuilder:
                        origin: Optional[Context] = None, offset: int = 0,
                        code: Optional[ErrorCode] = None) -> None:
         """Report as many notes as lines in the message (unless disabled)."""
+        if self.are_errors_discarded():
+            return
         for msg in messages.splitlines():
             self.report(msg, context, 'note', file=file, origin=origin,
                         offset=offset, code=code)
@@ -237,6 +261,8 @@ class MessageBuilder:
         If member corresponds to an operator, use the corresponding operator
         name in the messages. Return type Any.
         """
+        if self.are_errors_discarded():
+            return AnyType(TypeOfAny.from_error)
         original_type = get_proper_type(original_type)
         typ = get_proper_type(typ)
 
@@ -246,13 +272,10 @@ class MessageBuilder:
         elif member == '__contains__':
             self.fail('Unsupported right operand type for in ({})'.format(
                 format_type(original_type)), context, code=codes.OPERATOR)
-        elif member in op_methods.values():
+        elif member in op_method_set:
             # Access to a binary operator member (e.g. _add). This case does
             # not handle indexing operations.
-            for op, method in op_methods.items():
-                if method == member:
-                    self.unsupported_left_operand(op, original_type, context)
-                    break
+            self.unsupported_left_operand(op_methods_to_symbols[member], original_type, context)
         elif member == '__neg__':
             self.fail('Unsupported operand type for unary - ({})'.format(
                 format_type(original_type)), context, code=codes.OPERATOR)
@@ -294,15 +317,14 @@ class MessageBuilder:
             if not self.disable_type_names:
                 failed = False
                 if isinstance(original_type, Instance) and original_type.type.names:
-                    alternatives = set(original_type.type.names.keys())
+                    alternatives = set(original_type.type.names)
 
                     if module_symbol_table is not None:
-                        alternatives |= {key for key in module_symbol_table.keys()}
+                        alternatives.update(module_symbol_table)
 
                     # in some situations, the member is in the alternatives set
                     # but since we're in this function, we shouldn't suggest it
-                    if member in alternatives:
-                        alternatives.remove(member)
+                    alternatives.discard(member)
 
                     matches = [m for m in COMMON_MISTAKES.get(member, []) if m in alternatives]
                     matches.extend(best_matches(member, alternatives)[:3])
@@ -351,21 +373,23 @@ class MessageBuilder:
 
         Types can be Type objects or strings.
         """
-        left_str = ''
-        if isinstance(left_type, str):
-            left_str = left_type
-        else:
-            left_str = format_type(left_type)
-
-        right_str = ''
-        if isinstance(right_type, str):
-            right_str = right_type
-        else:
-            right_str = format_type(right_type)
-
+        if self.are_errors_discarded():
+            return
         if self.disable_type_names:
             msg = 'Unsupported operand types for {} (likely involving Union)'.format(op)
         else:
+            left_str = ''
+            if isinstance(left_type, str):
+                left_str = left_type
+            else:
+                left_str = format_type(left_type)
+
+            right_str = ''
+            if isinstance(right_type, str):
+                right_str = right_type
+            else:
+                right_str = format_type(right_type)
+
             msg = 'Unsupported operand types for {} ({} and {})'.format(
                 op, left_str, right_str)
         self.fail(msg, context, code=code)
@@ -408,53 +432,61 @@ class MessageBuilder:
         Return the error code that used for the argument (multiple error
         codes are possible).
         """
+        if self.are_errors_discarded():
+            return None
         arg_type = get_proper_type(arg_type)
 
         target = ''
         callee_name = callable_name(callee)
         if callee_name is not None:
             name = callee_name
-            if callee.bound_args and callee.bound_args[0] is not None:
-                base = format_type(callee.bound_args[0])
-            else:
-                base = extract_type(name)
-
-            for method, op in op_methods_to_symbols.items():
-                for variant in method, '__r' + method[2:]:
-                    # FIX: do not rely on textual formatting
-                    if name.startswith('"{}" of'.format(variant)):
-                        if op == 'in' or variant != method:
-                            # Reversed order of base/argument.
-                            self.unsupported_operand_types(op, arg_type, base,
-                                                           context, code=codes.OPERATOR)
-                        else:
-                            self.unsupported_operand_types(op, base, arg_type,
-                                                           context, code=codes.OPERATOR)
-                        return codes.OPERATOR
-
-            if name.startswith('"__cmp__" of'):
-                self.unsupported_operand_types("comparison", arg_type, base,
-                                               context, code=codes.OPERATOR)
-                return codes.INDEX
-
-            if name.startswith('"__getitem__" of'):
-                self.invalid_index_type(arg_type, callee.arg_types[n - 1], base, context,
-                                        code=codes.INDEX)
-                return codes.INDEX
-
-            if name.startswith('"__setitem__" of'):
-                if n == 1:
+            if name.startswith('"__'):
+                # Only special methods need the name of the base type, so don't
+                # format it for other callables.
+                if callee.bound_args and callee.bound_args[0] is not None:
+                    base = format_type(callee.bound_args[0])
+                else:
+                    base = extract_type(name)
+
+                # FIX: do not rely on textual formatting
+                method, _, rest = name[1:].partition('"')
+                if not rest.startswith(' of'):
+                    method = ''
+                op_variant = op_method_variants.get(method)
+                if op_variant is not None:
+                    op, reverse = op_variant
+                    if reverse:
+                        # Reversed order of base/argument.
+                        self.unsupported_operand_types(op, arg_type, base,
+                                                       context, code=codes.OPERATOR)
+                    else:
+                        self.unsupported_operand_types(op, base, arg_type,
+                                                       context, code=codes.OPERATOR)
+                    return codes.OPERATOR
+
+                if method == '__cmp__':
+                    self.unsupported_operand_types("comparison", arg_type, base,
+                                                   context, code=codes.OPERATOR)
+                    return codes.INDEX
+
+                if method == '__getitem__':
                     self.invalid_index_type(arg_type, callee.arg_types[n - 1], base, context,
                                             code=codes.INDEX)
                     return codes.INDEX
-                else:
-                    msg = '{} (expression has type {}, target has type {})'
-                    arg_type_str, callee_type_str = format_type_distinctly(arg_type,
-                                                                           callee.arg_types[n - 1])
-                    self.fail(msg.format(message_registry.INCOMPATIBLE_TYPES_IN_ASSIGNMENT,
-                                         arg_type_str, callee_type_str),
-                              context, code=codes.ASSIGNMENT)
-                    return codes.ASSIGNMENT
+
+                if method == '__setitem__':
+                    if n == 1:
+                        self.invalid_index_type(arg_type, callee.arg_types[n - 1], base, context,
+                                                code=codes.INDEX)
+                        return codes.INDEX
+                    else:
+                        msg = '{} (expression has type {}, target has type {})'
+                        arg_type_str, callee_type_str = format_type_distinctly(
+                            arg_type, callee.arg_types[n - 1])
+                        self.fail(msg.format(message_registry.INCOMPATIBLE_TYPES_IN_ASSIGNMENT,
+                                             arg_type_str, callee_type_str),
+                                  context, code=codes.ASSIGNMENT)
+                        return codes.ASSIGNMENT
 
             target = 'to {} '.format(name)
 
@@ -494,15 +526,15 @@ class MessageBuilder:
                 expected_key_type_str, expected_value_type_str)
             code = codes.DICT_ITEM
         elif callee_name == '<list-comprehension>':
-            actual_type_str, expected_type_str = map(strip_quotes,
-                                                     format_type_distinctly(arg_type,
-                                                                            callee.arg_types[0]))
+            actual_type_str, expected_type_str = format_type_distinctly(arg_type,
+                                                                        callee.arg_types[0],
+                                                                        bare=True)
             msg = 'List comprehension has incompatible type List[{}]; expected List[{}]'.format(
                 actual_type_str, expected_type_str)
         elif callee_name == '<set-comprehension>':
-            actual_type_str, expected_type_str = map(strip_quotes,
-                                                     format_type_distinctly(arg_type,
-                                                                            callee.arg_types[0]))
+            actual_type_str, expected_type_str = format_type_distinctly(arg_type,
+                                                                        callee.arg_types[0],
+                                                                        bare=True)
             msg = 'Set comprehension has incompatible type Set[{}]; expected Set[{}]'.format(
                 actual_type_str, expected_type_str)
         elif callee_name == '<dictionary-comprehension>':
@@ -564,12 +596,14 @@ class MessageBuilder:
                 code = codes.ARG_TYPE
             expected_type = get_proper_type(expected_type)
             if isinstance(expected_type, UnionType):
-                expected_types = list(expected_type.items)
+                expected_types = expected_type.items
             else:
                 expected_types = [expected_type]
-            for type in get_proper_types(expected_types):
-                if isinstance(arg_type, Instance) and isinstance(type, Instance):
-                    notes = append_invariance_notes(notes, arg_type, type)
+            if isinstance(arg_type, Instance):
+                for type in get_proper_types(expected_types):
+                    # Invariance notes are only given for the same class (list or dict).
+                    if isinstance(type, Instance) and type.type is arg_type.type:
+                        notes = append_invariance_notes(notes, arg_type, type)
         self.fail(msg, context, code=code)
         if notes:
             for note_msg in notes:
@@ -581,6 +615,8 @@ class MessageBuilder:
                                    callee_type: ProperType,
                                    context: Context,
                                    code: Optional[ErrorCode]) -> None:
+        if self.are_errors_discarded():
+            return
         if isinstance(original_caller_type, (Instance, TupleType, TypedDictType)):
             if isinstance(callee_type, Instance) and callee_type.type.is_protocol:
                 self.report_protocol_problems(original_caller_type, callee_type,
@@ -607,7 +643,7 @@ class MessageBuilder:
     def too_few_arguments(self, callee: CallableType, context: Context,
                           argument_names: Optional[Sequence[Optional[str]]]) -> None:
         if argument_names is not None:
-            num_positional_args = sum(k is None for k in argument_names)
+            num_positional_args = argument_names.count(None)
             arguments_left = callee.arg_names[num_positional_args:callee.min_args]
             diff = [k for k in arguments_left if k not in argument_names]
             if len(diff) == 1:
@@ -654,20 +690,19 @@ class MessageBuilder:
 
     def unexpected_keyword_argument(self, callee: CallableType, name: str, arg_type: Type,
                                     context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         msg = 'Unexpected keyword argument "{}"'.format(name) + for_function(callee)
         # Suggest intended keyword, look for type match else fallback on any match.
-        matching_type_args = []
-        not_matching_type_args = []
+        # Only names similar enough to be suggested need a (slow) subtype check.
+        kwarg_types = {}  # type: Dict[str, Type]
         for i, kwarg_type in enumerate(callee.arg_types):
             callee_arg_name = callee.arg_names[i]
             if callee_arg_name is not None and callee.arg_kinds[i] != ARG_STAR:
-                if is_subtype(arg_type, kwarg_type):
-                    matching_type_args.append(callee_arg_name)
-                else:
-                    not_matching_type_args.append(callee_arg_name)
-        matches = best_matches(name, matching_type_args)
-        if not matches:
-            matches = best_matches(name, not_matching_type_args)
+                kwarg_types.setdefault(callee_arg_name, kwarg_type)
+        matches = best_matches(name, kwarg_types)
+        matches = ([m for m in matches if is_subtype(arg_type, kwarg_types[m])]
+                   or matches)
         if matches:
             msg += "; did you mean {}?".format(pretty_seq(matches[:3], "or"))
         self.fail(msg, context, code=codes.CALL_ARG)
@@ -725,13 +760,15 @@ class MessageBuilder:
                                      context: Context,
                                      *,
                                      code: Optional[ErrorCode] = None) -> None:
+        if self.are_errors_discarded():
+            return
         code = code or codes.CALL_OVERLOAD
         name = callable_name(overload)
         if name:
             name_str = ' of {}'.format(name)
         else:
             name_str = ''
-        arg_types_str = ', '.join(format_type(arg) for arg in arg_types)
+        arg_types_str = ', '.join([format_type(arg) for arg in arg_types])
         num_args = len(arg_types)
         if num_args == 0:
             self.fail('All overload variants{} require at least one argument'.format(name_str),
@@ -791,6 +828,8 @@ class MessageBuilder:
             self, arg_num: int, name: str, type_name: Optional[str],
             name_in_supertype: str, arg_type_in_supertype: Type, supertype: str,
             context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         target = self.override_target(name, name_in_supertype, supertype)
         arg_type_in_supertype_f = format_type_bare(arg_type_in_supertype)
         self.fail('Argument {} of "{}" is incompatible with {}; '
@@ -812,13 +851,7 @@ class MessageBuilder:
             self.note_multiline(multiline_msg, context, code=codes.OVERRIDE)
 
     def comparison_method_example_msg(self, class_name: str) -> str:
-        return dedent('''\
-        It is recommended for "__eq__" to work with arbitrary objects, for example:
-            def __eq__(self, other: object) -> bool:
-                if not isinstance(other, {class_name}):
-                    return NotImplemented
-                return <logic to compare two {class_name} instances>
-        '''.format(class_name=class_name))
+        return COMPARISON_METHOD_EXAMPLE.format(class_name=class_name)
 
     def return_type_incompatible_with_supertype(
             self, name: str, name_in_supertype: str, supertype: str,
@@ -991,12 +1024,16 @@ class MessageBuilder:
                                    typ: Type,
                                    typevar_name: str,
                                    context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         self.fail(message_registry.INCOMPATIBLE_TYPEVAR_VALUE
                   .format(typevar_name, callable_name(callee) or 'function', format_type(typ)),
                   context,
                   code=codes.TYPE_VAR)
 
     def dangerous_comparison(self, left: Type, right: Type, kind: str, ctx: Context) -> None:
+        if self.are_errors_discarded():
+            return
         left_str = 'element' if kind == 'container' else 'left operand'
         right_str = 'container item' if kind == 'container' else 'right operand'
         message = 'Non-overlapping {} check ({} type: {}, {} type: {})'
@@ -1062,7 +1099,8 @@ class MessageBuilder:
             method, other_method), context)
 
     def yield_from_invalid_operand_type(self, expr: Type, context: Context) -> Type:
-        text = format_type(expr) if format_type(expr) != 'object' else expr
+        formatted = format_type(expr)
+        text = formatted if formatted != 'object' else expr
         self.fail('"yield from" can\'t be applied to {}'.format(text), context)
         return AnyType(TypeOfAny.from_error)
 
@@ -1078,8 +1116,9 @@ class MessageBuilder:
 
     def reveal_locals(self, type_map: Dict[str, Optional[Type]], context: Context) -> None:
         # To ensure that the output is predictable on Python < 3.6,
-        # use an ordered dictionary sorted by variable name
-        sorted_locals = OrderedDict(sorted(type_map.items(), key=lambda t: t[0]))
+        # use an ordered dictionary sorted by variable name. Names are unique,
+        # so sorting the items never needs to compare the types.
+        sorted_locals = OrderedDict(sorted(type_map.items()))
         self.note("Revealed local types are:", context)
         for line in ['    {}: {}'.format(k, v) for k, v in sorted_locals.items()]:
             self.note(line, context)
@@ -1088,10 +1127,14 @@ class MessageBuilder:
         self.fail('Cannot instantiate type "Type[{}]"'.format(format_type_bare(item)), context)
 
     def redundant_cast(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         self.fail('Redundant cast to {}'.format(format_type(typ)), context,
                   code=codes.REDUNDANT_CAST)
 
     def unimported_type_becomes_any(self, prefix: str, typ: Type, ctx: Context) -> None:
+        if self.are_errors_discarded():
+            return
         self.fail("{} becomes {} due to an unfollowed import".format(prefix, format_type(typ)),
                   ctx, code=codes.NO_ANY_UNIMPORTED)
 
@@ -1101,9 +1144,8 @@ class MessageBuilder:
         has_variable_annotations = not python_version or python_version >= (3, 6)
         # Only gives hint if it's a variable declaration and the partial type is a builtin type
         if (python_version and isinstance(node, Var) and isinstance(node.type, PartialType) and
-                node.type.type and node.type.type.fullname in reverse_builtin_aliases):
-            alias = reverse_builtin_aliases[node.type.type.fullname]
-            alias = alias.split('.')[-1]
+                node.type.type and node.type.type.fullname in SHORT_BUILTIN_ALIASES):
+            alias = SHORT_BUILTIN_ALIASES[node.type.type.fullname]
             type_dec = '<type>'
             if alias == 'Dict':
                 type_dec = '{}, {}'.format(type_dec, type_dec)
@@ -1129,6 +1171,8 @@ class MessageBuilder:
             expected_keys: List[str],
             actual_keys: List[str],
             context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         actual_set = set(actual_keys)
         expected_set = set(expected_keys)
         if not typ.is_anonymous():
@@ -1208,6 +1252,8 @@ class MessageBuilder:
             default: Type,
             expected: Type,
             context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         msg = 'Argument 2 to "setdefault" of "TypedDict" has incompatible type {}; expected {}'
         self.fail(msg.format(format_type(default), format_type(expected)), context,
                   code=codes.TYPEDDICT_ITEM)
@@ -1216,6 +1262,8 @@ class MessageBuilder:
         self.fail('Parameterized generics cannot be used with class or instance checks', context)
 
     def disallowed_any_type(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         typ = get_proper_type(typ)
         if isinstance(typ, AnyType):
             message = 'Expression has type "Any"'
@@ -1224,6 +1272,8 @@ class MessageBuilder:
         self.fail(message, context)
 
     def incorrectly_returning_any(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         message = 'Returning Any from function declared to return {}'.format(
             format_type(typ))
         self.fail(message, context, code=codes.NO_ANY_RETURN)
@@ -1241,6 +1291,8 @@ class MessageBuilder:
             context, code=codes.EXIT_RETURN)
 
     def untyped_decorated_function(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         typ = get_proper_type(typ)
         if isinstance(typ, AnyType):
             self.fail("Function is untyped after decorator transformation", context)
@@ -1260,10 +1312,14 @@ class MessageBuilder:
         self.fail(msg, context)
 
     def concrete_only_assign(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         self.fail("Can only assign concrete classes to a variable of type {}"
                   .format(format_type(typ)), context)
 
     def concrete_only_call(self, typ: Type, context: Context) -> None:
+        if self.are_errors_discarded():
+            return
         self.fail("Only concrete class can be given where {} is expected"
                   .format(format_type(typ)), context)
 
@@ -1286,6 +1342,8 @@ class MessageBuilder:
                   context: Context,
                   *,
                   code: Optional[ErrorCode]) -> None:
+        if self.are_errors_discarded():
+            return
         self.note('"{}.__call__" has type {}'.format(format_type_bare(subtype),
                                                      format_type(call, verbosity=1)),
                   context, code=code)
@@ -1342,6 +1400,9 @@ class MessageBuilder:
         attribute flags, such as settable vs read-only or class variable vs
         instance variable.
         """
+        if self.are_errors_discarded():
+            # Finding the conflicts requires subtype checks; skip them if nothing is shown.
+            return
         OFFSET = 4  # Four spaces, so that notes will look like this:
         # note: 'Cls' is missing following 'Proto' members:
         # note:     method, attr
@@ -1623,9 +1684,8 @@ def format_type_inner(typ: Type,
         elif itype.type.fullname == 'builtins.tuple':
             item_type_str = format(itype.args[0])
             return 'Tuple[{}, ...]'.format(item_type_str)
-        elif itype.type.fullname in reverse_builtin_aliases:
-            alias = reverse_builtin_aliases[itype.type.fullname]
-            alias = alias.split('.')[-1]
+        elif itype.type.fullname in SHORT_BUILTIN_ALIASES:
+            alias = SHORT_BUILTIN_ALIASES[itype.type.fullname]
             items = [format(arg) for arg in itype.args]
             return '{}[{}]'.format(alias, ', '.join(items))
         else:
@@ -1974,20 +2034,24 @@ def capitalize(s: str) -> str:
         return s[0].upper() + s[1:]
 
 
+# Map operator method names, also reverse ones such as __radd__, to the operator
+# symbol and whether the operands are shown in reverse order in messages.
+op_method_variants = {
+    variant: (op, op == 'in' or variant != method)
+    for method, op in op_methods_to_symbols.items()
+    for variant in (method, '__r' + method[2:])
+}  # type: Final[Dict[str, Tuple[str, bool]]]
+
+
+EXTRACT_TYPE_RE = re.compile('^"[a-zA-Z0-9_]+" of ')  # type: Final
+
+
 def extract_type(name: str) -> str:
     """If the argument is the name of a method (of form C.m), return
     the type portion in quotes (e.g. "y"). Otherwise, return the string
     unmodified.
     """
-    name = re.sub('^"[a-zA-Z0-9_]+" of ', '', name)
-    return name
-
-
-def strip_quotes(s: str) -> str:
-    """Strip a double quote at the beginning and end of the string, if any."""
-    s = re.sub('^"', '', s)
-    s = re.sub('"$', '', s)
-    return s
+    return EXTRACT_TYPE_RE.sub('', name)
 
 
 def plural_s(s: Union[int, Sequence[Any]]) -> str:
@@ -2002,6 +2066,8 @@ def format_string_list(lst: List[str]) -> str:
     assert len(lst) > 0
     if len(lst) == 1:
         return lst[0]
+    elif len(lst) == 2:
+        return '%s and %s' % (lst[0], lst[1])
     elif len(lst) <= 5:
         return '%s and %s' % (', '.join(lst[:-1]), lst[-1])
     else:
@@ -2058,8 +2124,17 @@ COMMON_MISTAKES = {
 
 
 def best_matches(current: str, options: Iterable[str]) -> List[str]:
-    ratios = {v: difflib.SequenceMatcher(a=current, b=v).ratio() for v in options}
-    return sorted((o for o in options if ratios[o] > 0.75),
+    ratios = {}  # type: Dict[str, float]
+    matcher = difflib.SequenceMatcher(a=current)
+    for v in options:
+        matcher.set_seq2(v)
+        # real_quick_ratio() and quick_ratio() are cheap upper bounds for ratio(),
+        # so most poor matches can be rejected without computing the full ratio.
+        if matcher.real_quick_ratio() > 0.75 and matcher.quick_ratio() > 0.75:
+            ratio = matcher.ratio()
+            if ratio > 0.75:
+                ratios[v] = ratio
+    return sorted((o for o in options if o in ratios),
                   reverse=True, key=lambda v: (ratios[v], v))
 
 
@@ -2130,11 +2205,10 @@ def make_inferred_type_note(context: Context,
 
 
 def format_key_list(keys: List[str], *, short: bool = False) -> str:
-    formatted_keys = ['"{}"'.format(key) for key in keys]
     td = '' if short else 'TypedDict '
     if len(keys) == 0:
         return 'no {}keys'.format(td)
     elif len(keys) == 1:
-        return '{}key {}'.format(td, formatted_keys[0])
+        return '{}key "{}"'.format(td, keys[0])
     else:
-        return '{}keys ({})'.format(td, ', '.join(formatted_keys))
+        return '{}keys ({})'.format(td, ', '.join(['"{}"'.format(key) for key in keys]))
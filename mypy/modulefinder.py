@@ -198,17 +198,19 @@ class FindModuleCache:
         If fast_path is True, prioritize performance over generating detailed
         error descriptions.
         """
-        if id not in self.results:
+        result = self.results.get(id)
+        if result is None:
             top_level = id.partition('.')[0]
             use_typeshed = True
             if top_level in self.stdlib_py_versions:
                 use_typeshed = self._typeshed_has_version(top_level)
-            self.results[id] = self._find_module(id, use_typeshed)
+            result = self._find_module(id, use_typeshed)
             if (not fast_path
-                    and self.results[id] is ModuleNotFoundReason.NOT_FOUND
+                    and result is ModuleNotFoundReason.NOT_FOUND
                     and self._can_find_module_in_parent_dir(id)):
-                self.results[id] = ModuleNotFoundReason.WRONG_WORKING_DIRECTORY
-        return self.results[id]
+                result = ModuleNotFoundReason.WRONG_WORKING_DIRECTORY
+            self.results[id] = result
+        return result
 
     def _typeshed_has_version(self, module: str) -> bool:
         if not self.options:
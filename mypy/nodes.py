@@ -1657,6 +1657,7 @@ op_methods = {
     'in': '__contains__',
 }  # type: Final
 
+op_method_set = set(op_methods.values())  # type: Final
 op_methods_to_symbols = {v: k for (k, v) in op_methods.items()}  # type: Final
 op_methods_to_symbols['__div__'] = '/'
 
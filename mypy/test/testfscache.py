@@ -5,9 +5,11 @@ import shutil
 import sys
 import tempfile
 import unittest
+from unittest import mock
 from typing import Optional
 
 from mypy.fscache import FileSystemCache
+from mypy.util import hash_digest
 
 
 class TestFileSystemCache(unittest.TestCase):
@@ -87,6 +89,38 @@ class TestFileSystemCache(unittest.TestCase):
                 # this path is not under the prefix, case difference is fine.
                 assert self.isfile_case(os.path.join(other, 'PKG/other_dir.py'))
 
+    def test_read_primes_stat_cache(self) -> None:
+        self.make_file('bar.py')
+        path = os.path.join(self.tempdir, 'bar.py')
+        assert path not in self.fscache.stat_cache
+        # The first read stats the open file instead of the path, and
+        # caches the result.
+        with mock.patch('os.stat', side_effect=AssertionError('os.stat called')):
+            assert self.fscache.read(path) == b'# test file'
+        assert path in self.fscache.stat_cache
+        assert isinstance(self.fscache.stat_cache[path], os.stat_result)
+        # Run twice to test both cached and non-cached code paths.
+        for i in range(2):
+            assert self.fscache.read(path) == b'# test file'
+            assert self.fscache.stat(path).st_size == len(b'# test file')
+        with self.assertRaises(OSError):
+            self.fscache.read(os.path.join(self.tempdir, 'missing.py'))
+        with self.assertRaises(OSError):
+            self.fscache.stat(os.path.join(self.tempdir, 'missing.py'))
+        with self.assertRaises(OSError):
+            self.fscache.read(self.tempdir)
+        assert self.fscache.isdir(self.tempdir)
+
+    def test_read_with_cached_stat(self) -> None:
+        self.make_file('bar.py')
+        path = os.path.join(self.tempdir, 'bar.py')
+        st = self.fscache.stat(path)
+        with mock.patch('os.fstat', side_effect=AssertionError('os.fstat called')):
+            assert self.fscache.read(path) == b'# test file'
+        # The stat result cached before the read is kept.
+        assert self.fscache.stat_cache[path] is st
+        assert self.fscache.hash_digest(path) == hash_digest(b'# test file')
+
     def make_file(self, path: str, base: Optional[str] = None) -> None:
         if base is None:
             base = self.tempdir
@@ -38,6 +38,14 @@ class GraphSuite(Suite):
                       frozenset({'B', 'C'}),
                       frozenset({'D'})})
 
+    def test_scc_deep_chain(self) -> None:
+        # A long cycle shouldn't hit the recursion limit.
+        n = sys.getrecursionlimit() * 2
+        vertices = {str(i) for i in range(n)}
+        edges = {str(i): [str((i + 1) % n)] for i in range(n)}
+        sccs = list(strongly_connected_components(vertices, edges))
+        assert_equal(sccs, [vertices])
+
     def _make_manager(self) -> BuildManager:
         errors = Errors()
         options = Options()
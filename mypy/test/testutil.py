@@ -1,7 +1,7 @@
 import os
 from unittest import mock, TestCase
 
-from mypy.util import get_terminal_width
+from mypy.util import get_terminal_width, json_loads
 
 
 class TestGetTerminalSize(TestCase):
@@ -13,3 +13,22 @@ class TestGetTerminalSize(TestCase):
         with mock.patch.object(os, 'get_terminal_size', return_value=ret):
             with mock.patch.dict(os.environ, values=mock_environ, clear=True):
                 assert get_terminal_width() == 80
+
+
+class TestJsonLoads(TestCase):
+    def test_json_loads_falls_back_on_ujson_error(self) -> None:
+        # ujson isn't a test requirement, so use a stub in its place.
+        stub = mock.Mock()
+        stub.loads.side_effect = ValueError('Value is too big')
+        with mock.patch('mypy.util.UJSON_INSTALLED', True):
+            with mock.patch('mypy.util.ujson', stub, create=True):
+                assert json_loads('{"x": 18446744073709551616}') == {'x': 2**64}
+        stub.loads.assert_called_once_with('{"x": 18446744073709551616}')
+
+    def test_json_loads_uses_ujson_result(self) -> None:
+        stub = mock.Mock()
+        stub.loads.return_value = {'from': 'ujson'}
+        with mock.patch('mypy.util.UJSON_INSTALLED', True):
+            with mock.patch('mypy.util.ujson', stub, create=True):
+                assert json_loads('{"from": "json"}') == {'from': 'ujson'}
+        stub.loads.assert_called_once_with('{"from": "json"}')
@@ -1246,10 +1246,7 @@ class CallableType(FunctionLike):
         return bool(self.variables)
 
     def type_var_ids(self) -> List[TypeVarId]:
-        a = []  # type: List[TypeVarId]
-        for tv in self.variables:
-            a.append(tv.id)
-        return a
+        return [tv.id for tv in self.variables]
 
     def __hash__(self) -> int:
         return hash((self.ret_type, self.is_type_obj(),
@@ -2311,6 +2308,10 @@ class HasTypeVars(TypeQuery[bool]):
 
 def has_type_vars(typ: Type) -> bool:
     """Check if a type contains any type variables (recursively)."""
+    proper = get_proper_type(typ)
+    if isinstance(proper, Instance) and not proper.args:
+        # Fast path: a non-generic instance can't contain type variables.
+        return False
     return typ.accept(HasTypeVars())
 
 